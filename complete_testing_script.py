@@ -8,12 +8,15 @@ Date: February 5, 2024
 Version: 1.0.0
 """
 
-import requests
-import base64
-import json
+import asyncio
+import concurrent.futures
+import hashlib
+import orjson
 import os
 import sys
-from pathlib import Path
+import threading
+import time
+import zlib
 from datetime import datetime
 
 # ============================================================================
@@ -22,7 +25,28 @@ from datetime import datetime
 
 API_URL = "http://localhost:8000"
 API_KEY = "my-secret-key"
-RESULTS_FILE = "detection_results.json"
+RESULTS_FILE = "detection_results.jsonl"
+MIN_FILE_SIZE = int(0.1 * 1024 * 1024)  # 0.1 MB
+MAX_FILE_SIZE = 25 * 1024 * 1024        # 25 MB
+BATCH_CONCURRENCY = 8
+BATCH_SIZE = 16
+BATCH_MAX_BYTES = 96 * 1024 * 1024  # raw audio per request (under 140MB once base64-encoded)
+BATCH_ENCODE_CONCURRENCY = 2  # chunks read and compressed at the same time
+POOL_SIZE = 32  # keep-alive connections kept open per host
+CACHE_TTL = 300  # seconds to reuse /supported-languages and /stats responses
+DETECT_CACHE_FILE = "detect_cache.jsonl"
+USE_DETECT_CACHE = True  # disabled with --no-cache
+
+# Shared session so every call reuses pooled keep-alive connections.
+# Created on first use so menu paths that never hit the API skip importing requests.
+_session = None
+_session_lock = threading.Lock()
+
+# Per-process cache of static GET responses: path -> (fetched_at, etag, data)
+_RESPONSE_CACHE = {}
+
+# Detection results keyed by "<content hash>:<language>", loaded on first use
+_detect_cache = None
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -54,14 +78,38 @@ def print_info(message):
     """Print info message"""
     print(f"ℹ {message}")
 
+def get_session():
+    """Return the shared requests.Session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            # Pool sized above the default 10 so concurrent callers never
+            # fall back to throwaway connections
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE,
+                pool_maxsize=POOL_SIZE,
+                max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+            )
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update({"x_api_key": API_KEY, "Connection": "keep-alive"})
+        return _session
+
 def check_api_connection():
     """Check if API is running and accessible"""
+    import requests
+    
     print_section("Checking API Connection")
     
     try:
-        response = requests.get(f"{API_URL}/", timeout=5)
+        response = get_session().get(f"{API_URL}/", timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print_success(f"API is running on {API_URL}")
             print_info(f"API Version: {data.get('version', 'Unknown')}")
             print_info(f"Status: {data.get('status', 'Unknown')}")
@@ -77,18 +125,43 @@ def check_api_connection():
         print_error(f"Connection error: {str(e)}")
         return False
 
+def cached_get(path):
+    """
+    GET a rarely-changing endpoint, reusing the cached body for CACHE_TTL seconds
+    
+    Once the TTL expires the request is revalidated with If-None-Match,
+    so an unchanged resource costs only an empty 304 response.
+    
+    Returns:
+        dict: Response body or None if the request failed
+    """
+    cached = _RESPONSE_CACHE.get(path)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL:
+        return cached[2]
+    
+    headers = {}
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+    
+    response = get_session().get(f"{API_URL}{path}", headers=headers, timeout=5)
+    
+    if response.status_code == 304 and cached:
+        _RESPONSE_CACHE[path] = (time.monotonic(), cached[1], cached[2])
+        return cached[2]
+    
+    if response.status_code == 200:
+        data = orjson.loads(response.content)
+        _RESPONSE_CACHE[path] = (time.monotonic(), response.headers.get("ETag"), data)
+        return data
+    
+    return None
+
 def get_supported_languages():
     """Get list of supported languages from API"""
     try:
-        response = requests.get(
-            f"{API_URL}/supported-languages",
-            headers={"x_api_key": API_KEY},
-            timeout=5
-        )
-        if response.status_code == 200:
-            data = response.json()
-            languages = data.get('supported_languages', [])
-            return languages
+        data = cached_get("/supported-languages")
+        if data:
+            return data.get('supported_languages', [])
     except Exception as e:
         print_error(f"Error getting languages: {str(e)}")
     
@@ -97,40 +170,143 @@ def get_supported_languages():
 def get_api_stats():
     """Get API statistics"""
     try:
-        response = requests.get(
-            f"{API_URL}/stats",
-            headers={"x_api_key": API_KEY},
-            timeout=5
-        )
-        if response.status_code == 200:
-            return response.json()
+        return cached_get("/stats")
     except Exception as e:
         print_error(f"Error getting stats: {str(e)}")
     
     return None
 
 def validate_audio_file(file_path):
-    """Validate audio file exists and size is acceptable"""
-    if not os.path.exists(file_path):
+    """
+    Validate audio file exists and size is acceptable
+    
+    Returns:
+        os.stat_result: File status if valid (reuse it instead of
+                        stat-ing the file again), otherwise None
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
         print_error(f"File not found: {file_path}")
-        return False
+        return None
     
-    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    file_size_mb = stat.st_size / (1024 * 1024)
     
-    if file_size_mb > 25:
+    if stat.st_size > MAX_FILE_SIZE:
         print_error(f"File too large: {file_size_mb:.2f} MB (max 25 MB)")
-        return False
+        return None
     
-    if file_size_mb < 0.1:
+    if stat.st_size < MIN_FILE_SIZE:
         print_error(f"File too small: {file_size_mb:.2f} MB (min 0.1 MB)")
-        return False
+        return None
     
-    return True
+    return stat
 
 def get_file_extension(file_path):
     """Get file extension"""
     return file_path.split('.')[-1].lower()
 
+def encode_b64_stream(file_path, chunk=192 * 1024):
+    """
+    Base64-encode a file without holding the raw bytes in memory
+    
+    The file is read into one reusable buffer and each encoded chunk is
+    copied straight into a bytearray preallocated to the final size.
+    
+    Args:
+        file_path: Path to file
+        chunk: Read size in bytes; must be a multiple of 3 so that only
+               the final chunk can produce padding
+    
+    Returns:
+        bytearray: Base64-encoded file contents (ASCII)
+    """
+    import base64
+    
+    if chunk % 3:
+        raise ValueError("chunk must be a multiple of 3")
+    
+    buf = bytearray(chunk)
+    view = memoryview(buf)
+    
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        out = bytearray((size + 2) // 3 * 4)
+        pos = 0
+        while True:
+            # Fill the whole buffer so padding can only appear at EOF
+            n = 0
+            while n < chunk:
+                read = f.readinto(view[n:])
+                if not read:
+                    break
+                n += read
+            if not n:
+                break
+            encoded = base64.b64encode(view[:n])
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+            if n < chunk:
+                break
+    
+    # Only differs from the preallocated size if the file changed while reading
+    del out[pos:]
+    return out
+
+def detection_cache_key(file_path, language):
+    """Build the detection cache key from the file contents and language"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return f"{h.hexdigest()}:{language}"
+
+def _load_detect_cache():
+    """Load the on-disk detection cache once per process (later lines win)"""
+    global _detect_cache
+    if _detect_cache is None:
+        cache = {}
+        try:
+            with open(DETECT_CACHE_FILE, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                        cache[entry["key"]] = entry["result"]
+                    except (orjson.JSONDecodeError, KeyError, TypeError):
+                        # A line cut short by a crash only loses that entry
+                        continue
+        except FileNotFoundError:
+            pass
+        _detect_cache = cache
+    return _detect_cache
+
+def lookup_detection(key):
+    """Return the cached API result for a key, or None (always None with --no-cache)"""
+    if not USE_DETECT_CACHE:
+        return None
+    return _load_detect_cache().get(key)
+
+def remember_detections(entries):
+    """Add {key: result} entries to the detection cache, appending them to its file"""
+    if not entries:
+        return
+    _load_detect_cache().update(entries)
+    try:
+        # One JSON object per line: appending never rewrites earlier entries
+        lines = [
+            orjson.dumps({"key": key, "result": result}) + b"\n"
+            for key, result in entries.items()
+        ]
+        with open(DETECT_CACHE_FILE, 'a+b') as f:
+            # Start on a fresh line if a crash left the last one unfinished
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines.insert(0, b"\n")
+            f.write(b"".join(lines))
+    except OSError as e:
+        print_error(f"Could not save detection cache: {str(e)}")
+
 def detect_voice(audio_file_path, language="english"):
     """
     Send audio to API for detection
@@ -142,13 +318,15 @@ def detect_voice(audio_file_path, language="english"):
     Returns:
         dict: API response or None if error
     """
+    import requests
     
     # Validate file
-    if not validate_audio_file(audio_file_path):
+    stat = validate_audio_file(audio_file_path)
+    if stat is None:
         return None
     
     # Get file info
-    file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+    file_size_mb = stat.st_size / (1024 * 1024)
     file_name = os.path.basename(audio_file_path)
     file_ext = get_file_extension(audio_file_path)
     
@@ -158,45 +336,35 @@ def detect_voice(audio_file_path, language="english"):
     print_info(f"Format: {file_ext.upper()}")
     print_info(f"Language: {language.upper()}")
     
+    # Identical audio was already classified: skip the API call
+    cache_key = detection_cache_key(audio_file_path, language)
+    cached = lookup_detection(cache_key)
+    if cached:
+        print_success("Using cached result (file unchanged since last detection)")
+        return cached
+    
     try:
-        # Read audio file
-        print_section("Reading Audio File", "-")
-        with open(audio_file_path, 'rb') as f:
-            audio_data = f.read()
-        print_success(f"File read successfully ({len(audio_data)} bytes)")
-        
-        # Encode to base64
-        print_section("Encoding to Base64", "-")
-        audio_base64 = base64.b64encode(audio_data).decode()
-        print_success(f"Encoding complete ({len(audio_base64)} characters)")
-        
-        # Prepare request
-        print_section("Preparing Request", "-")
-        payload = {
-            "audio_base64": audio_base64,
-            "audio_format": file_ext,
-            "language": language
-        }
-        print_success("Request prepared")
-        
-        # Send to API
+        # Send raw bytes as a multipart upload (no base64 inflation)
         print_section("Sending to API", "-")
         print_info(f"Endpoint: POST {API_URL}/detect")
         print_info("Sending request...")
         
-        response = requests.post(
-            f"{API_URL}/detect",
-            json=payload,
-            headers={"x_api_key": API_KEY},
-            timeout=30
-        )
+        with open(audio_file_path, 'rb') as f:
+            response = get_session().post(
+                f"{API_URL}/detect",
+                files={"file": (file_name, f, f"audio/{file_ext}")},
+                data={"language": language, "audio_format": file_ext},
+                timeout=30
+            )
         
         # Handle response
         if response.status_code == 200:
             print_success("API response received")
-            return response.json()
+            result = orjson.loads(response.content)
+            remember_detections({cache_key: result})
+            return result
         else:
-            data = response.json()
+            data = orjson.loads(response.content)
             detail = data.get('detail', 'Unknown error')
             print_error(f"API Error ({response.status_code}): {detail}")
             return None
@@ -254,42 +422,60 @@ def display_result(result):
     return result
 
 def save_results(audio_file, result):
-    """Save results to JSON file"""
+    """Append a result to the JSON Lines results file"""
     try:
-        # Read existing results
-        results = []
-        if os.path.exists(RESULTS_FILE):
-            with open(RESULTS_FILE, 'r') as f:
-                results = json.load(f)
-        
-        # Add new result
         entry = {
             "file": audio_file,
             "timestamp": datetime.now().isoformat(),
             "result": result
         }
-        results.append(entry)
         
-        # Save results
-        with open(RESULTS_FILE, 'w') as f:
-            json.dump(results, f, indent=2)
+        # One JSON object per line: appending never rewrites earlier results
+        with open(RESULTS_FILE, 'ab') as f:
+            f.write(orjson.dumps(entry) + b"\n")
         
         print_success(f"Results saved to {RESULTS_FILE}")
     except Exception as e:
         print_error(f"Could not save results: {str(e)}")
 
+def write_json_atomic(path, data):
+    """Write JSON to path in one write, replacing any old file only once it is on disk"""
+    body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_results():
+    """Load all saved results from the JSON Lines results file"""
+    if not os.path.exists(RESULTS_FILE):
+        return []
+    
+    with open(RESULTS_FILE, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
 def run_diagnostics():
     """Run full diagnostic test"""
     print_header("AI VOICE DETECTION - DIAGNOSTIC TEST")
     
-    # Check API connection
-    if not check_api_connection():
-        print_error("Cannot proceed without API connection")
-        return False
+    # The three checks are independent, so fetch stats and languages in the
+    # background while the connection check runs and prints in this thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        stats_future = executor.submit(get_api_stats)
+        languages_future = executor.submit(get_supported_languages)
+        
+        # Check API connection
+        if not check_api_connection():
+            print_error("Cannot proceed without API connection")
+            return False
+        
+        stats = stats_future.result()
+        languages = languages_future.result()
     
     # Get API stats
     print_section("Getting API Statistics")
-    stats = get_api_stats()
     if stats:
         print_success("API Statistics retrieved")
         print_info(f"Version: {stats.get('version')}")
@@ -298,7 +484,6 @@ def run_diagnostics():
     
     # Get languages
     print_section("Getting Supported Languages")
-    languages = get_supported_languages()
     if languages:
         print_success("Languages retrieved")
         for i, lang in enumerate(languages, 1):
@@ -354,18 +539,229 @@ def interactive_detection():
     else:
         print_error("Detection failed")
 
-def batch_detection(directory):
+def build_batch_body(audio_file_paths, language):
+    """
+    Build the gzipped /detect-batch JSON body for a chunk of files
+    
+    Each file is base64-encoded, fed straight to the compressor and then
+    released, so only one file's encoding is held next to the compressed
+    output and the uncompressed body is never assembled.
+    
+    Args:
+        audio_file_paths: Paths to the audio files to send
+        language: Language code applied to every item
+    
+    Returns:
+        bytes: Gzip-compressed {"items": [...]} JSON body
+    """
+    # wbits 16 + MAX_WBITS writes a gzip container, as gzip.compress does
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    parts = [compressor.compress(b'{"items":[')]
+    for n, audio_file_path in enumerate(audio_file_paths):
+        audio_base64 = encode_b64_stream(audio_file_path)
+        parts.append(compressor.compress(b',{"audio_base64":"' if n else b'{"audio_base64":"'))
+        parts.append(compressor.compress(audio_base64))
+        del audio_base64
+        parts.append(compressor.compress(
+            b'","audio_format":' + orjson.dumps(get_file_extension(audio_file_path))
+            + b',"language":' + orjson.dumps(language) + b'}'
+        ))
+    parts.append(compressor.compress(b']}'))
+    parts.append(compressor.flush())
+    return b''.join(parts)
+
+def prepare_batch(audio_file_paths, language):
+    """
+    Look up cached results for a chunk and build the request body for the rest
+    
+    Returns:
+        tuple: (results, positions, keys, body) where results holds cached
+               results (None elsewhere), positions/keys describe the files
+               still to send, and body is their gzipped request (or None)
+    """
+    results = [None] * len(audio_file_paths)
+    
+    # Only files not yet cached are sent; remember where each one goes back
+    positions = []
+    keys = []
+    for i, audio_file_path in enumerate(audio_file_paths):
+        key = detection_cache_key(audio_file_path, language)
+        cached = lookup_detection(key)
+        if cached:
+            results[i] = cached
+            continue
+        keys.append(key)
+        positions.append(i)
+    
+    if not positions:
+        return results, positions, keys, None
+    
+    body = build_batch_body([audio_file_paths[i] for i in positions], language)
+    return results, positions, keys, body
+
+def chunks(items, size, max_bytes=None, sizes=None):
+    """
+    Split a list into consecutive chunks of at most `size` items
+    
+    Given per-item `sizes`, a chunk is also closed before its total would
+    exceed `max_bytes` (an item larger than that still gets a chunk of its own).
+    """
+    chunk = []
+    total = 0
+    for item in items:
+        item_size = sizes[item] if sizes else 0
+        if chunk and (len(chunk) == size or (max_bytes and total + item_size > max_bytes)):
+            yield chunk
+            chunk = []
+            total = 0
+        chunk.append(item)
+        total += item_size
+    if chunk:
+        yield chunk
+
+async def detect_batch_async(session, audio_file_paths, language="english", encode_slots=None):
+    """
+    Send several audio files to the API in one /detect-batch request
+    
+    Args:
+        session: Shared aiohttp.ClientSession
+        audio_file_paths: Paths to audio files (at most BATCH_SIZE), already
+                          size-checked by batch_detection
+        language: Language code (english, tamil, hindi, malayalam, telugu)
+        encode_slots: asyncio.Semaphore shared by concurrent calls to bound
+                      how many chunks are read and compressed at once
+    
+    Returns:
+        list: One API result (or None if error) per input path, in order
+    """
+    import aiohttp
+    
+    if encode_slots is None:
+        encode_slots = asyncio.Semaphore(BATCH_ENCODE_CONCURRENCY)
+    
+    # Hashing, encoding and compressing read whole files: run them in a
+    # thread so other chunks' requests keep moving on the event loop
+    async with encode_slots:
+        results, positions, keys, body = await asyncio.to_thread(
+            prepare_batch, audio_file_paths, language
+        )
+    
+    if body is None:
+        return results
+    
+    try:
+        async with session.post(
+            f"{API_URL}/detect-batch",
+            data=body,
+            headers={
+                "x_api_key": API_KEY,
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip"
+            },
+            timeout=aiohttp.ClientTimeout(total=30 * len(positions))
+        ) as response:
+            data = orjson.loads(await response.read())
+            if response.status != 200:
+                detail = data.get('detail', 'Unknown error')
+                print_error(f"API Error ({response.status}): {detail}")
+                return results
+    
+    except asyncio.TimeoutError:
+        print_error(f"Request timed out ({len(positions)} file(s))")
+        return results
+    except aiohttp.ClientConnectionError:
+        print_error("Cannot connect to API")
+        return results
+    except Exception as e:
+        print_error(f"Error: {str(e)}")
+        return results
+    
+    fresh = {}
+    for i, key, result in zip(positions, keys, data.get('results', [])):
+        if result.get('status') == "success":
+            results[i] = result
+            fresh[key] = result
+        else:
+            file_name = os.path.basename(audio_file_paths[i])
+            print_error(f"{file_name}: {result.get('detail', 'Unknown error')}")
+    
+    remember_detections(fresh)
+    return results
+
+async def _run_batch(audio_files, sizes, language, concurrency):
+    """
+    Detect files in chunks of at most BATCH_SIZE files and BATCH_MAX_BYTES
+    (by `sizes`), with at most `concurrency` requests in flight
+    
+    Each chunk is displayed and appended to RESULTS_FILE as soon as it
+    finishes, so slow chunks don't hold back fast ones and an interrupted
+    run keeps everything completed so far.
+    
+    Returns:
+        list: {"file", "result"} entries for every successful detection
+    """
+    import aiohttp
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    encode_slots = asyncio.Semaphore(BATCH_ENCODE_CONCURRENCY)
+
+    async def bounded(chunk):
+        async with semaphore:
+            return chunk, await detect_batch_async(session, chunk, language, encode_slots)
+
+    results = []
+    done = 0
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [asyncio.create_task(bounded(chunk)) for chunk in chunks(audio_files, BATCH_SIZE, BATCH_MAX_BYTES, sizes)]
+        for next_done in asyncio.as_completed(tasks):
+            chunk, chunk_results = await next_done
+            for audio_file, result in zip(chunk, chunk_results):
+                done += 1
+                print_section(f"Result {done}/{len(audio_files)}: {os.path.basename(audio_file)}")
+                if result:
+                    display_result(result)
+                    save_results(audio_file, result)
+                    results.append({
+                        "file": audio_file,
+                        "result": result
+                    })
+    
+    return results
+
+def batch_detection(directory, language="english", concurrency=BATCH_CONCURRENCY):
     """Batch detection on multiple files"""
     print_header(f"BATCH DETECTION - {directory}")
     
-    audio_extensions = ('.mp3', '.wav', '.ogg', '.flac', '.m4a')
-    audio_files = []
+    audio_extensions = {'.mp3', '.wav', '.ogg', '.flac', '.m4a'}
     
-    # Find audio files
+    # Find audio files in a single directory pass (extension match is
+    # case-insensitive). Sizes are checked here too, from the entry's cached
+    # stat, so out-of-range files never enter the work list.
     print_section("Finding Audio Files")
-    for ext in audio_extensions:
-        audio_files.extend(Path(directory).glob(f"*{ext}"))
-        audio_files.extend(Path(directory).glob(f"*{ext.upper()}"))
+    audio_files = []
+    sizes = {}
+    skipped = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in audio_extensions:
+                    continue
+                size = entry.stat().st_size
+                if MIN_FILE_SIZE <= size <= MAX_FILE_SIZE:
+                    audio_files.append(entry.path)
+                    sizes[entry.path] = size
+                else:
+                    skipped.append((entry.name, size))
+    except OSError as e:
+        print_error(f"Cannot read directory {directory}: {e.strerror}")
+        return
+    
+    audio_files.sort()
+    for name, size in sorted(skipped):
+        print_info(f"Skipping {name}: {size / (1024 * 1024):.2f} MB (allowed 0.1-25 MB)")
     
     if not audio_files:
         print_error(f"No audio files found in {directory}")
@@ -373,27 +769,23 @@ def batch_detection(directory):
     
     print_success(f"Found {len(audio_files)} audio file(s)")
     
-    # Process each file
-    results = []
-    for i, audio_file in enumerate(audio_files, 1):
-        print_section(f"Processing {i}/{len(audio_files)}")
-        result = detect_voice(str(audio_file), "english")
-        if result:
-            display_result(result)
-            results.append({
-                "file": str(audio_file),
-                "result": result
-            })
+    # Process files in batched, concurrent requests
+    print_section(f"Processing {len(audio_files)} file(s) in batches of {BATCH_SIZE}")
+    results = asyncio.run(_run_batch(audio_files, sizes, language, concurrency))
     
     # Save batch results
     if results:
         batch_file = f"batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(batch_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        write_json_atomic(batch_file, results)
         print_success(f"Batch results saved to {batch_file}")
 
 def main():
     """Main function"""
+    global USE_DETECT_CACHE
+    if "--no-cache" in sys.argv:
+        sys.argv.remove("--no-cache")
+        USE_DETECT_CACHE = False
+    
     print_header("🎙️  AI VOICE DETECTION - TESTING SCRIPT 🎙️", "=")
     
     # Show menu
@@ -1,53 +1,88 @@
-import base64
-import uuid
+import asyncio
+import gzip
+import hashlib
+import hmac
+import io
 import os
-import json
+import threading
+import zlib
+import orjson
+import pybase64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from fastapi import FastAPI, Header, HTTPException, UploadFile, File, Depends
+from functools import partial
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import Optional
-from model import predict_voice
-
-API_KEY = os.getenv("API_KEY", "teamAI_123")
+from typing import Final, List, Optional
+from model import predict_voice, predict_voice_batch, warmup
 
 app = FastAPI(
     title="AI Voice Detection API",
     description="Detects whether voice samples are AI-generated or human",
-    version="1.0.0"
-)
-
-# Add CORS middleware for frontend access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # --------------------------------- 
 # Configuration
 # --------------------------------- 
 
-API_KEY = os.getenv("API_KEY", "teamAI_123")
-UPLOAD_DIR = "temp_audio"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+API_KEY: Final[str] = os.getenv("API_KEY", "teamAI_123")
 
-# --------------------------------- 
-# Authentication Dependency
-# --------------------------------- 
+# Blocking model inference runs here so it never stalls the event loop
+INFERENCE_POOL: Final = ThreadPoolExecutor(max_workers=os.cpu_count())
 
-def verify_api_key(x_api_key: str = Header(...)):
-    if x_api_key != API_KEY:
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid or missing API key"
-        )
+# Accepted size range for decoded audio
+MAX_AUDIO_BYTES: Final[int] = 25 << 20
+MIN_AUDIO_BYTES: Final[int] = 1024
+
+# Base64 payloads larger than this are decoded off the event loop
+INLINE_DECODE_LIMIT: Final[int] = 1 << 20
+
+# Concurrent detections are grouped into one model call of up to this many
+# clips, waiting at most INFERENCE_BATCH_WINDOW seconds for a batch to fill
+INFERENCE_BATCH_SIZE: Final[int] = 16
+INFERENCE_BATCH_WINDOW: Final[float] = 0.01
+
+# Number of recent predictions kept, keyed by a hash of the audio bytes
+PREDICTION_CACHE_SIZE: Final[int] = 1024
+
+# Longest base64 string that can decode to MAX_AUDIO_BYTES (4 chars per 3 bytes)
+MAX_BASE64_LENGTH: Final[int] = (MAX_AUDIO_BYTES + 2) // 3 * 4
+
+# Endpoints that require the x-api-key header
+PROTECTED_PATHS: Final[frozenset] = frozenset({
+    "/predict", "/predict_batch", "/detect", "/detect-base64", "/detect-batch",
+    "/stats", "/supported-languages"
+})
 
 # Supported languages
-SUPPORTED_LANGUAGES = ["tamil", "english", "hindi", "malayalam", "telugu"]
+SUPPORTED_LANGUAGES: Final[frozenset] = frozenset({"tamil", "english", "hindi", "malayalam", "telugu"})
+SUPPORTED_LANGUAGES_STR: Final[str] = ", ".join(sorted(SUPPORTED_LANGUAGES))
+
+# Maximum number of audio items accepted by /detect-batch
+MAX_BATCH_ITEMS: Final[int] = 32
+
+# How long clients may cache the static metadata endpoints (seconds)
+CACHE_MAX_AGE: Final[int] = 300
+
+# Largest request body accepted on the wire (a full-size file plus encoding overhead)
+MAX_REQUEST_BODY: Final[int] = 35 << 20
+
+# Largest batch request body (before and after gzip inflation). Batches are
+# bounded by total size as well as item count, so a full batch of full-size
+# files must be split across requests rather than buffered as one ~1GB body.
+MAX_BATCH_BODY: Final[int] = 4 * MAX_REQUEST_BODY
+
+# Paths allowed a larger body than MAX_REQUEST_BODY
+REQUEST_BODY_LIMITS: Final[dict] = {
+    "/detect-batch": MAX_BATCH_BODY,
+    "/predict_batch": MAX_BATCH_BODY
+}
 
 # --------------------------------- 
 # Pydantic Models
@@ -55,11 +90,20 @@ SUPPORTED_LANGUAGES = ["tamil", "english", "hindi", "malayalam", "telugu"]
 
 class AudioRequest(BaseModel):
     """Request model for voice detection"""
-    audio_base64: str = Field(..., description="Base64-encoded audio file")
+    audio_base64: str = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BASE64_LENGTH,
+        description="Base64-encoded audio file (max 25MB decoded)"
+    )
     audio_format: str = Field(default="mp3", description="Audio format (mp3, wav, etc.)")
     language: str = Field(default="english", description="Language of the audio")
     user_id: Optional[str] = Field(default=None, description="Optional user identifier")
 
+class BatchAudioRequest(BaseModel):
+    """Request model for batch voice detection"""
+    items: List[AudioRequest] = Field(..., description="Audio items to classify")
+
 class DetectionResponse(BaseModel):
     """Response model for detection results"""
     status: str
@@ -69,6 +113,11 @@ class DetectionResponse(BaseModel):
     timestamp: str
     message: str
 
+class BatchDetectionResponse(BaseModel):
+    """Response model for batch detection results"""
+    status: str
+    results: List[dict]
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
@@ -78,23 +127,367 @@ class HealthResponse(BaseModel):
 # Utility Functions
 # --------------------------------- 
 
-def validate_api_key(api_key: Optional[str]) -> bool:
-    """Validate incoming API key"""
-    if not api_key:
-        return False
-    return api_key == API_KEY
-
 def validate_language(language: str) -> bool:
     """Validate language is supported"""
     return language.lower() in SUPPORTED_LANGUAGES
 
-def cleanup_file(path: str) -> None:
-    """Safely remove temporary file"""
-    try:
-        if os.path.exists(path):
-            os.remove(path)
-    except Exception as e:
-        print(f"Warning: Could not cleanup file {path}: {e}")
+class StaticJSON:
+    """A JSON body that never changes at runtime, serialized and hashed once"""
+    
+    def __init__(self, content: dict):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+        # Served behind the API key: browsers may cache it, shared caches must not
+        self.headers = {"Cache-Control": f"private, max-age={CACHE_MAX_AGE}", "ETag": self.etag}
+    
+    def response(self, request: Request) -> Response:
+        """Return the body with Cache-Control/ETag headers, or 304 if the client copy is current"""
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=self.headers)
+        
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+SUPPORTED_LANGUAGES_JSON = StaticJSON({
+    "status": "success",
+    "supported_languages": sorted(SUPPORTED_LANGUAGES)
+})
+
+STATS_JSON = StaticJSON({
+    "status": "success",
+    "version": "1.0.0",
+    "supported_languages": sorted(SUPPORTED_LANGUAGES),
+    "max_file_size_mb": MAX_AUDIO_BYTES >> 20,
+    "supported_formats": ["mp3", "wav", "ogg", "flac"]
+})
+
+# --------------------------------- 
+# Prediction Cache
+# --------------------------------- 
+
+_prediction_cache = OrderedDict()
+_prediction_cache_lock = threading.Lock()
+
+def cached_predict_batch(items: list) -> list:
+    """Classify (audio_bytes, audio_format) pairs, running the model only on cache misses"""
+    keys = [hashlib.blake2b(audio_bytes, digest_size=16).digest() for audio_bytes, _ in items]
+    results = [None] * len(items)
+    misses = []
+    
+    with _prediction_cache_lock:
+        for i, key in enumerate(keys):
+            if key in _prediction_cache:
+                _prediction_cache.move_to_end(key)
+                results[i] = _prediction_cache[key]
+            else:
+                misses.append(i)
+    
+    if not misses:
+        return results
+    
+    # The same BLAKE2b-128 digest keys the model's feature cache; pass it on
+    # rather than hashing the audio twice
+    predictions = predict_voice_batch(
+        [(io.BytesIO(items[i][0]), items[i][1]) for i in misses],
+        keys=[keys[i].hex() for i in misses]
+    )
+    
+    with _prediction_cache_lock:
+        for i, prediction in zip(misses, predictions):
+            results[i] = prediction
+            if isinstance(prediction, Exception):
+                continue
+            _prediction_cache[keys[i]] = prediction
+            if len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+                _prediction_cache.popitem(last=False)
+    
+    return results
+
+def cached_predict(audio_bytes: bytes, audio_format: str) -> tuple:
+    """Classify a single clip through the prediction cache"""
+    result = cached_predict_batch([(audio_bytes, audio_format)])[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+# --------------------------------- 
+# Inference Micro-Batching
+# --------------------------------- 
+
+class InferenceBatcher:
+    """Group concurrent predictions into batched model calls on INFERENCE_POOL"""
+    
+    def __init__(self, batch_size: int = INFERENCE_BATCH_SIZE, window: float = INFERENCE_BATCH_WINDOW):
+        self.batch_size = batch_size
+        self.window = window
+        self.queue = None
+        self.task = None
+        self.in_flight = set()
+    
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+    
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._worker())
+    
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+    
+    async def predict(self, audio_bytes: bytes, audio_format: str) -> tuple:
+        """Classify one clip, batched with any other clips submitted meanwhile"""
+        loop = asyncio.get_running_loop()
+        
+        # Without the worker (e.g. a TestClient used outside a with block),
+        # fall back to classifying the clip on its own
+        if not self.running:
+            return await loop.run_in_executor(
+                INFERENCE_POOL, cached_predict, audio_bytes, audio_format
+            )
+        
+        future = loop.create_future()
+        await self.queue.put((audio_bytes, audio_format, future))
+        return await future
+    
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Run the batch without waiting, so several batches can use the pool
+            task = asyncio.create_task(self._run_batch(batch))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+    
+    async def _run_batch(self, batch: list):
+        loop = asyncio.get_running_loop()
+        items = [(audio_bytes, audio_format) for audio_bytes, audio_format, _ in batch]
+        
+        try:
+            results = await loop.run_in_executor(INFERENCE_POOL, cached_predict_batch, items)
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+inference_batcher = InferenceBatcher()
+
+# --------------------------------- 
+# Middleware
+# --------------------------------- 
+
+def route_path(scope) -> str:
+    """Request path as the router sees it, without any root_path prefix.
+    
+    Behind a proxy mount (uvicorn --root-path /api), scope["path"] still
+    carries the prefix; routing strips it, so path-based checks must too.
+    """
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if not root_path or not path.startswith(root_path):
+        return path
+    if path == root_path:
+        return "/"
+    if path[len(root_path)] == "/":
+        return path[len(root_path):]
+    return path
+
+class BodySizeLimitMiddleware:
+    """Answer 413 as soon as a request body is known to exceed its size limit"""
+    
+    def __init__(self, app, max_size: int = MAX_REQUEST_BODY, path_limits: dict = REQUEST_BODY_LIMITS):
+        self.app = app
+        self.max_size = max_size
+        self.path_limits = path_limits
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.path_limits.get(route_path(scope), self.max_size)
+        too_large = ORJSONResponse(
+            status_code=413,
+            content={"status": "error", "detail": "Request body too large"}
+        )
+        
+        # Declared size: reject before reading anything
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await too_large(scope, receive, send)
+            return
+        
+        # Chunked uploads: count bytes as they arrive and cut the request off
+        received = 0
+        rejected = False
+        
+        async def receive_limited():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not rejected:
+                    rejected = True
+                    await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+        
+        async def send_unless_rejected(message):
+            if not rejected:
+                await send(message)
+        
+        try:
+            await self.app(scope, receive_limited, send_unless_rejected)
+        except Exception:
+            # The app sees a disconnect once its body is cut off; the 413 is already sent
+            if not rejected:
+                raise
+
+class ApiKeyMiddleware:
+    """Reject requests to protected paths without a valid x-api-key header.
+    
+    Runs before routing, so unauthenticated uploads are refused without
+    reading (or inflating) their bodies.
+    """
+    
+    def __init__(self, app, api_key: str = API_KEY, protected_paths=PROTECTED_PATHS):
+        self.app = app
+        self.api_key = api_key.encode()
+        self.protected_paths = protected_paths
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or route_path(scope) not in self.protected_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        x_api_key = dict(scope["headers"]).get(b"x-api-key", b"")
+        if not hmac.compare_digest(x_api_key, self.api_key):
+            response = ORJSONResponse(
+                status_code=401,
+                content={"status": "error", "detail": "Invalid or missing API key"}
+            )
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
+
+class GzipRequestMiddleware:
+    """Transparently inflate request bodies sent with Content-Encoding: gzip.
+    
+    Bodies are inflated chunk by chunk as they arrive and capped at the same
+    per-path limits as plain bodies, so a small gzip bomb is cut off once it
+    passes the limit instead of being inflated in full on the event loop.
+    """
+    
+    def __init__(self, app, max_size: int = MAX_REQUEST_BODY, path_limits: dict = REQUEST_BODY_LIMITS):
+        self.app = app
+        self.max_size = max_size
+        self.path_limits = path_limits
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if dict(scope["headers"]).get(b"content-encoding", b"").lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.path_limits.get(route_path(scope), self.max_size)
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = []
+        inflated = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more_body = message.get("more_body", False)
+                
+                # Inflating one byte past the limit is enough to reject the body
+                chunk = inflater.decompress(message.get("body", b""), limit - inflated + 1)
+                inflated += len(chunk)
+                if inflated > limit:
+                    response = ORJSONResponse(
+                        status_code=413,
+                        content={"status": "error", "detail": "Request body too large"}
+                    )
+                    await response(scope, receive, send)
+                    return
+                chunks.append(chunk)
+            
+            if not inflater.eof:
+                raise zlib.error("truncated gzip stream")
+        except zlib.error:
+            response = ORJSONResponse(
+                status_code=400,
+                content={"status": "error", "detail": "Invalid gzip request body"}
+            )
+            await response(scope, receive, send)
+            return
+        
+        body = b"".join(chunks)
+        del chunks
+        
+        headers = [
+            (k, v) for k, v in scope["headers"]
+            if k not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = dict(scope, headers=headers)
+        
+        body_sent = False
+        
+        async def receive_inflated():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        await self.app(scope, receive_inflated, send)
+
+# Last added runs first: compress responses, answer CORS, enforce the body
+# size limit, check the API key, and only then inflate gzip request bodies
+app.add_middleware(GzipRequestMiddleware)
+app.add_middleware(ApiKeyMiddleware)
+app.add_middleware(BodySizeLimitMiddleware)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # --------------------------------- 
 # HTML Frontend
@@ -482,20 +875,19 @@ HTML_CONTENT = """
             result.classList.remove('active');
 
             try {
-                const base64Audio = await fileToBase64(selectedFile);
                 const fileExt = selectedFile.name.split('.').pop().toLowerCase();
 
+                const form = new FormData();
+                form.append('file', selectedFile);
+                form.append('audio_format', fileExt);
+                form.append('language', language.value);
+
                 const response = await fetch('/detect', {
                     method: 'POST',
                     headers: {
-                        'Content-Type': 'application/json',
                         'x-api-key': key
                     },
-                    body: JSON.stringify({
-                        audio_base64: base64Audio,
-                        audio_format: fileExt,
-                        language: language.value
-                    })
+                    body: form
                 });
 
                 const data = await response.json();
@@ -513,18 +905,6 @@ HTML_CONTENT = """
             }
         });
 
-        function fileToBase64(file) {
-            return new Promise((resolve, reject) => {
-                const reader = new FileReader();
-                reader.onload = () => {
-                    const base64 = reader.result.split(',')[1];
-                    resolve(base64);
-                };
-                reader.onerror = reject;
-                reader.readAsDataURL(file);
-            });
-        }
-
         function showSuccess(data) {
             result.className = 'result active success';
             resultTitle.textContent = `✅ ${data.message}`;
@@ -567,65 +947,251 @@ HTML_CONTENT = """
 </html>
 """
 
+# The page never changes at runtime, so compress it and hash it once at import
+HTML_BYTES = HTML_CONTENT.encode("utf-8")
+HTML_GZIP = gzip.compress(HTML_BYTES, compresslevel=9)
+HTML_ETAG = f'"{hashlib.blake2b(HTML_BYTES, digest_size=8).hexdigest()}"'
+# Strong ETags name exact bytes, so the gzip body needs its own
+HTML_GZIP_ETAG = HTML_ETAG[:-1] + '-gz"'
+HTML_CACHE_MAX_AGE = 3600
+
+# --------------------------------- 
+# Timestamps
+# --------------------------------- 
+
+# Response timestamps have one-second resolution; a background task
+# refreshes this string so requests don't each format a new one
+_timestamp = datetime.utcnow().isoformat()
+_timestamp_task = None
+
+async def _tick_timestamp():
+    global _timestamp
+    while True:
+        _timestamp = datetime.utcnow().isoformat()
+        await asyncio.sleep(1)
+
+def current_timestamp() -> str:
+    """Return the cached UTC timestamp, or a fresh one if the ticker isn't running"""
+    if _timestamp_task is None or _timestamp_task.done():
+        return datetime.utcnow().isoformat()
+    return _timestamp
+
+# --------------------------------- 
+# Detection
+# --------------------------------- 
+
+def require_supported_language(language: str) -> None:
+    """Raise a 400 error if the language is not supported"""
+    if not validate_language(language):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported language. Supported: {SUPPORTED_LANGUAGES_STR}"
+        )
+
+async def detect_audio(data: AudioRequest) -> DetectionResponse:
+    """Validate, decode and classify a single base64 audio request"""
+    
+    require_supported_language(data.language)
+    
+    # Empty and oversized payloads were already rejected by AudioRequest
+    # validation, before the decode below is paid for
+    try:
+        if len(data.audio_base64) > INLINE_DECODE_LIMIT:
+            loop = asyncio.get_running_loop()
+            audio_bytes = await loop.run_in_executor(
+                None, partial(pybase64.b64decode, validate=True), data.audio_base64
+            )
+        else:
+            audio_bytes = pybase64.b64decode(data.audio_base64, validate=True)
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid base64 encoding: {str(e)}"
+        )
+    
+    return await classify_audio(audio_bytes, data.audio_format, data.language)
+
+async def classify_audio(audio_bytes: bytes, audio_format: str, language: str) -> DetectionResponse:
+    """Run the classifier on raw audio bytes and build the response"""
+    
+    try:
+        if len(audio_bytes) > MAX_AUDIO_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail="Audio file too large (max 25MB)"
+            )
+        
+        if len(audio_bytes) < MIN_AUDIO_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail="Audio file too small"
+            )
+        
+        try:
+            label, confidence = await inference_batcher.predict(audio_bytes, audio_format)
+        except Exception as e:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Audio processing failed: {str(e)}"
+            )
+        
+        return DetectionResponse.model_construct(
+            status="success",
+            classification=label,
+            confidence_score=confidence,
+            language=language.lower(),
+            timestamp=current_timestamp(),
+            message=f"Audio classified as {label} with {confidence*100:.1f}% confidence"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 # --------------------------------- 
 # API Endpoints
 # --------------------------------- 
 
 @app.get("/")
-def root():
-    return {"status": "running"}
+def root(request: Request):
+    """Serve the web UI to browsers and a status check to everyone else"""
+    if "text/html" not in request.headers.get("accept", ""):
+        return {"status": "running"}
+    
+    gzipped = "gzip" in request.headers.get("accept-encoding", "")
+    etag = HTML_GZIP_ETAG if gzipped else HTML_ETAG
+    headers = {
+        "Cache-Control": f"public, max-age={HTML_CACHE_MAX_AGE}",
+        "ETag": etag,
+        "Vary": "Accept, Accept-Encoding"
+    }
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=HTML_GZIP, media_type="text/html", headers=headers)
+    
+    return Response(content=HTML_BYTES, media_type="text/html", headers=headers)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return HealthResponse(
+    return HealthResponse.model_construct(
         status="healthy",
         version="1.0.0"
     )
 
 @app.post("/predict")
-def predict_voice_api(
-    file: UploadFile = File(...),
-    _: str = Depends(verify_api_key)
-):
+async def predict_voice_api(file: UploadFile = File(...)):
     try:
-        # Create unique filename to avoid collisions
         file_ext = file.filename.split('.')[-1] if '.' in file.filename else "wav"
-        filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = f"{UPLOAD_DIR}/{filename}"
-
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
-
-        label, confidence = predict_voice(file_path)
-
-        # Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
+        
+        # UploadFile is already spooled; decode it in place without a temp copy
+        loop = asyncio.get_running_loop()
+        label, confidence = await loop.run_in_executor(
+            INFERENCE_POOL, predict_voice, file.file, file_ext
+        )
+        
         return {
             "label": label,
             "confidence": round(confidence, 3)
         }
     except Exception as e:
-        # Cleanup on error if file exists
-        if 'file_path' in locals() and os.path.exists(file_path):
-            os.remove(file_path)
-            
         raise HTTPException(
             status_code=500,
             detail=f"Error processing file: {str(e)}"
         )
 
 
+@app.post("/predict_batch")
+async def predict_batch_api(files: List[UploadFile] = File(...)):
+    """
+    Classify several uploaded files with one batched model call.
+    
+    Returns one entry per file, in upload order: label and confidence,
+    or an error message if that file could not be processed.
+    """
+    if len(files) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (max {MAX_BATCH_ITEMS})"
+        )
+    
+    audios = [
+        (file.file, file.filename.split('.')[-1] if '.' in file.filename else "wav")
+        for file in files
+    ]
+    
+    try:
+        loop = asyncio.get_running_loop()
+        predictions = await loop.run_in_executor(INFERENCE_POOL, predict_voice_batch, audios)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing files: {str(e)}"
+        )
+    
+    results = []
+    for prediction in predictions:
+        if isinstance(prediction, Exception):
+            results.append({"error": str(prediction)})
+        else:
+            label, confidence = prediction
+            results.append({"label": label, "confidence": round(confidence, 3)})
+    
+    return {"results": results}
+
+
 @app.post("/detect", response_model=DetectionResponse)
 async def detect(
-    data: AudioRequest,
-    x_api_key: str = Header(None)
+    file: UploadFile = File(...),
+    language: str = Form("english"),
+    audio_format: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None)
 ):
     """
     Detect whether audio is AI-generated or human-spoken.
     
+    The audio is sent as raw bytes in a multipart/form-data upload.
+    
+    Headers:
+        x_api_key: Your API key (required)
+    
+    Form Fields:
+        - file: Audio file
+        - language: Language code (tamil, english, hindi, malayalam, telugu)
+        - audio_format: Format of audio (default: taken from the filename)
+        - user_id: Optional user identifier
+    
+    Returns:
+        Detection result with classification and confidence score
+    """
+    
+    require_supported_language(language)
+    
+    if not audio_format:
+        audio_format = file.filename.split('.')[-1] if '.' in file.filename else "wav"
+    
+    audio_bytes = await file.read()
+    
+    return await classify_audio(audio_bytes, audio_format, language)
+
+
+@app.post("/detect-base64", response_model=DetectionResponse)
+async def detect_base64(data: AudioRequest):
+    """
+    Detect whether base64-encoded audio is AI-generated or human-spoken.
+    
+    Deprecated: kept for existing JSON clients. Prefer /detect, which takes
+    the raw file and avoids the 33% base64 size and decoding overhead.
+    
     Headers:
         x_api_key: Your API key (required)
     
@@ -639,111 +1205,80 @@ async def detect(
         Detection result with classification and confidence score
     """
     
-    if not validate_api_key(x_api_key):
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid or missing API key"
-        )
+    return await detect_audio(data)
+
+
+@app.post("/detect-batch", response_model=BatchDetectionResponse)
+async def detect_batch(data: BatchAudioRequest):
+    """
+    Detect several audio samples in a single request.
+    
+    Headers:
+        x_api_key: Your API key (required)
+    
+    Request Body:
+        - items: List of /detect-base64 request bodies (max 32)
+    
+    Returns:
+        One result per item, in request order. Items that fail carry
+        status "error" and a detail message instead of a classification.
+    """
     
-    if not validate_language(data.language):
+    if not data.items:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported language. Supported: {', '.join(SUPPORTED_LANGUAGES)}"
+            detail="items cannot be empty"
         )
     
-    if not data.audio_base64:
+    if len(data.items) > MAX_BATCH_ITEMS:
         raise HTTPException(
             status_code=400,
-            detail="audio_base64 cannot be empty"
+            detail=f"Too many items (max {MAX_BATCH_ITEMS})"
         )
     
-    file_path = None
-    try:
+    async def detect_item(item: AudioRequest) -> dict:
         try:
-            audio_bytes = base64.b64decode(data.audio_base64)
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid base64 encoding: {str(e)}"
-            )
-        
-        if len(audio_bytes) > 25 * 1024 * 1024:
-            raise HTTPException(
-                status_code=413,
-                detail="Audio file too large (max 25MB)"
-            )
-        
-        if len(audio_bytes) < 1024:
-            raise HTTPException(
-                status_code=400,
-                detail="Audio file too small"
-            )
-        
-        filename = f"{uuid.uuid4()}.{data.audio_format}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        with open(file_path, "wb") as f:
-            f.write(audio_bytes)
-        
-        try:
-            label, confidence = predict_voice(file_path)
-        except Exception as e:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Audio processing failed: {str(e)}"
-            )
-        
-        return DetectionResponse(
-            status="success",
-            classification=label,
-            confidence_score=confidence,
-            language=data.language.lower(),
-            timestamp=datetime.utcnow().isoformat(),
-            message=f"Audio classified as {label} with {confidence*100:.1f}% confidence"
-        )
+            return (await detect_audio(item)).model_dump()
+        except HTTPException as e:
+            return {"status": "error", "detail": e.detail}
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)}"
-        )
-    finally:
-        if file_path:
-            cleanup_file(file_path)
+    # Items are classified concurrently on the inference pool
+    results = await asyncio.gather(*(detect_item(item) for item in data.items))
+    
+    return BatchDetectionResponse.model_construct(status="success", results=list(results))
 
 
 @app.get("/supported-languages")
-async def get_supported_languages(x_api_key: str = Header(None)):
+async def get_supported_languages(request: Request):
     """Get list of supported languages"""
-    if not validate_api_key(x_api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    return {
-        "status": "success",
-        "supported_languages": SUPPORTED_LANGUAGES
-    }
+    return SUPPORTED_LANGUAGES_JSON.response(request)
 
 @app.get("/stats")
-async def get_stats(x_api_key: str = Header(None)):
+async def get_stats(request: Request):
     """Get API statistics"""
-    if not validate_api_key(x_api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    return {
-        "status": "success",
-        "version": "1.0.0",
-        "supported_languages": SUPPORTED_LANGUAGES,
-        "max_file_size_mb": 25,
-        "supported_formats": ["mp3", "wav", "ogg", "flac"]
-    }
+    return STATS_JSON.response(request)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    global _timestamp_task
+    _timestamp_task = asyncio.create_task(_tick_timestamp())
+    inference_batcher.start()
+    
+    # Load the model and compile the feature/inference path before serving
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(INFERENCE_POOL, warmup)
 
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await inference_batcher.stop()
+    if _timestamp_task is not None:
+        _timestamp_task.cancel()
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "status": "error",
@@ -757,6 +1292,14 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8080)),
+        workers=int(os.getenv("WORKERS", max(2, os.cpu_count() or 2))),
+        # "auto" picks uvloop/httptools when installed (not on Windows)
+        loop="auto",
+        http="auto",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        backlog=2048,
+        log_level=os.getenv("LOG_LEVEL", "warning"),
     )
 
 
@@ -1,8 +1,16 @@
 import numpy as np
 import librosa
+from numba import njit
 import warnings
-import pickle
+import joblib
 import os
+import io
+import hashlib
+import functools
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 warnings.filterwarnings('ignore')
@@ -13,62 +21,329 @@ warnings.filterwarnings('ignore')
 
 MODEL_PATH = "voice_classifier_model.pkl"
 SCALER_PATH = "voice_scaler.pkl"
+# Flattened forest node arrays (.npy), memory-mapped so every worker process
+# shares one copy through the page cache. Written by train_model/export_forest.
+FOREST_DIR = "voice_forest"
+
+# Model and scaler shared by every prediction, loaded on first use.
+# Re-entrant because a first load may train (and so re-cache) the model.
+_model_cache = {"model": None, "scaler": None, "scaling": None, "forest": None}
+_model_lock = threading.RLock()
+
+# Feature extraction for batches is spread over these threads; the STFT and
+# decoding work happens in numpy/soundfile code that releases the GIL
+_extract_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Where audio is spilled when it can only be decoded from a path.
+# /dev/shm is RAM-backed, so the spill never touches the disk; when it is
+# full (Docker gives containers only 64MB) the system temp dir is used.
+AUDIO_SPILL_DIR = os.getenv(
+    "AUDIO_SPILL_DIR",
+    "/dev/shm/teamai_audio" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+
+# Audio is decoded at this rate, keeping at most MAX_DURATION seconds
+SAMPLE_RATE = 8000
+MAX_DURATION = 5
+
+# Set FEATURE_CACHE_DIR to cache extracted feature vectors there, keyed by a
+# hash of the audio content (useful when re-extracting a training set). It is
+# off by default: the directory is never pruned, and the server already keeps
+# a bounded in-memory cache of predictions. Bump FEATURE_VERSION whenever
+# extract_features' output changes so stale vectors are never reused.
+FEATURE_CACHE_DIR = os.getenv("FEATURE_CACHE_DIR")
+FEATURE_VERSION = 4
+
+# Names of the 48 features, in the order features_from_signal writes them
+FEATURE_NAMES = (
+    *[f"mfcc_mean_{i}" for i in range(20)],
+    *[f"mfcc_std_{i}" for i in range(20)],
+    "spec_centroid_mean", "spec_centroid_std",
+    "spec_rolloff_mean", "spec_rolloff_std",
+    "spec_bandwidth_mean",
+    "zcr_mean", "zcr_std",
+    "chroma_mean"
+)
+
+# --------------------------------- 
+# Audio Loading
+# --------------------------------- 
+
+def load_audio(audio, fmt=None, **kwargs):
+    """
+    Load audio with librosa from a path, raw bytes, or a binary file-like object.
+    
+    In-memory audio is decoded directly by soundfile. Formats soundfile cannot
+    read from a stream (e.g. m4a) are written to a temporary file in
+    AUDIO_SPILL_DIR so librosa can fall back to its path-based audioread decoder.
+    
+    Args:
+        audio: Path, bytes, or binary file-like object
+        fmt: Audio format/extension, used to name the fallback temp file
+        **kwargs: Passed through to librosa.load
+    
+    Returns:
+        tuple: (y, sr) as returned by librosa.load
+    """
+    if isinstance(audio, (str, os.PathLike)):
+        return librosa.load(audio, **kwargs)
+    
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = io.BytesIO(audio)
+    
+    try:
+        return librosa.load(audio, **kwargs)
+    except Exception:
+        try:
+            spill = spill_audio(audio, fmt, AUDIO_SPILL_DIR)
+        except OSError:
+            spill = spill_audio(audio, fmt, tempfile.gettempdir())
+        with spill:
+            return librosa.load(spill.name, **kwargs)
+
+
+def spill_audio(audio, fmt, directory):
+    """
+    Copy a binary stream into a new temporary file in directory.
+    
+    The file is removed again if the copy fails (e.g. ENOSPC on a full tmpfs).
+    
+    Returns:
+        tempfile.NamedTemporaryFile: Open file, deleted when closed
+    """
+    os.makedirs(directory, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(suffix=f".{fmt or 'wav'}", dir=directory)
+    try:
+        audio.seek(0)
+        shutil.copyfileobj(audio, f, 1 << 20)
+        f.flush()
+    except BaseException:
+        f.close()
+        raise
+    return f
+
 
 # --------------------------------- 
 # Feature Extraction
 # --------------------------------- 
 
-def extract_features(path):
+def feature_cache_path(key):
+    """Path of the cached feature vector for a content key"""
+    return os.path.join(FEATURE_CACHE_DIR, f"{key}-v{FEATURE_VERSION}.npy")
+
+
+@functools.lru_cache(maxsize=1024)
+def read_cached_features(key):
+    """
+    Load a cached feature vector, keeping recent ones in memory.
+    
+    Raises FileNotFoundError on a miss; lru_cache does not remember
+    exceptions, so the vector is picked up once it has been saved.
+    """
+    features = np.load(feature_cache_path(key))
+    features.setflags(write=False)
+    return features
+
+
+def save_cached_features(key, features):
+    """Store a feature vector in the on-disk cache; failures are not fatal"""
+    try:
+        os.makedirs(FEATURE_CACHE_DIR, exist_ok=True)
+        path = feature_cache_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, features)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def extract_features(audio, fmt=None, key=None):
+    """
+    Extract audio features, reusing cached vectors for audio seen before
+    when FEATURE_CACHE_DIR is set.
+    
+    Args:
+        audio: Path, bytes, or binary file-like object (see load_audio)
+        fmt: Audio format/extension, if known
+        key: audio_content_key(audio), if the caller has already hashed it
+    
+    Returns:
+        np.array: Feature vector of shape (48,)
+    """
+    if not FEATURE_CACHE_DIR:
+        return compute_features(audio, fmt)
+    
+    if key is None:
+        key = audio_content_key(audio)
+    
+    try:
+        return read_cached_features(key)
+    except (OSError, ValueError):
+        pass
+    
+    features = compute_features(audio, fmt)
+    save_cached_features(key, features)
+    
+    return features
+
+
+def audio_content_key(audio, chunk_size=1 << 20):
+    """
+    Hash audio content for the feature cache without loading it all at once.
+    
+    Paths and file-like objects are hashed in chunks; file-like objects are
+    rewound afterwards so they can still be decoded.
+    
+    Args:
+        audio: Path, bytes, or binary file-like object
+        chunk_size: Bytes hashed per read
+    
+    Returns:
+        str: 128-bit BLAKE2b hex digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+    
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        h.update(audio)
+    elif isinstance(audio, (str, os.PathLike)):
+        with open(audio, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                h.update(chunk)
+    else:
+        start = audio.tell()
+        for chunk in iter(lambda: audio.read(chunk_size), b''):
+            h.update(chunk)
+        audio.seek(start)
+    
+    return h.hexdigest()
+
+
+def compute_features(audio, fmt=None):
     """
     Extract audio features using librosa for AI vs Human classification.
     Features include MFCC, spectral characteristics, and prosodic features.
     
+    Args:
+        audio: Path, bytes, or binary file-like object (see load_audio)
+        fmt: Audio format/extension, if known
+    
     Returns:
         np.array: Feature vector of shape (48,)
     """
     try:
-        # Load audio at 16kHz
-        y, sr = librosa.load(path, sr=16000, duration=10)
-        
-        # MFCC (Mel-frequency cepstral coefficients) - 20 coefficients
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
-        mfcc_mean = np.mean(mfcc, axis=1)
-        mfcc_std = np.std(mfcc, axis=1)
-        
-        # Spectral features
-        spec_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        spec_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-        spec_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-        zero_crossing_rate = librosa.feature.zero_crossing_rate(y)[0]
-        
-        # Temporal features
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        
-        # Chroma features
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-        chroma_mean = np.mean(chroma)
-        
-        # Combine all features (48 total features)
-        features = np.hstack([
-            mfcc_mean,                           # 20 features
-            mfcc_std,                            # 20 features
-            np.mean(spec_centroid),              # 1 feature
-            np.std(spec_centroid),               # 1 feature
-            np.mean(spec_rolloff),               # 1 feature
-            np.std(spec_rolloff),                # 1 feature
-            np.mean(spec_bandwidth),             # 1 feature
-            np.mean(zero_crossing_rate),         # 1 feature
-            np.std(zero_crossing_rate),          # 1 feature
-            chroma_mean                          # 1 feature
-        ])
-        # Total: 20 + 20 + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 1 = 48 features
-        
-        return features
+        # Load the first 5s at 8kHz: the voice cues used here sit below 4kHz.
+        # soxr_lq is librosa's cheapest bundled resampler.
+        y, sr = load_audio(
+            audio, fmt, sr=SAMPLE_RATE, duration=MAX_DURATION, mono=True, res_type="soxr_lq"
+        )
+        return features_from_signal(y, sr)
         
     except Exception as e:
         raise Exception(f"Feature extraction failed: {str(e)}")
 
 
+@functools.lru_cache(maxsize=8)
+def chroma_filterbank(sr, n_fft):
+    """
+    Chroma filter bank for a sample rate and FFT size, built once.
+
+    Tuning is fixed at 0 rather than estimated per clip: the estimate needs a
+    pitch track of the whole signal, and only the mean chroma is kept.
+    """
+    return librosa.filters.chroma(sr=sr, n_fft=n_fft, tuning=0.0)
+
+
+def frame_zero_crossing_rate(y, frame_length=2048, hop_length=512):
+    """
+    Per-frame zero-crossing rate, matching librosa.feature.zero_crossing_rate.
+    
+    Crossings are counted once over the whole (centered, edge-padded) signal
+    and each frame's count is read off a cumulative sum, instead of framing
+    the signal and scanning every frame separately.
+    """
+    y = np.pad(y, frame_length // 2, mode="edge")
+    # Like librosa, treat near-silent samples as zero (i.e. non-negative)
+    sign = np.signbit(np.where(np.abs(y) <= 1e-10, 0, y)).view(np.int8)
+    crossings = np.concatenate(([0], np.cumsum(np.diff(sign) != 0)))
+    starts = np.arange(0, len(y) - frame_length + 1, hop_length)
+    return (crossings[starts + frame_length - 1] - crossings[starts]) / frame_length
+
+
+def features_from_signal(y, sr):
+    """
+    Compute the 48-feature vector from an already decoded mono signal.
+    
+    Args:
+        y: Audio samples (float32)
+        sr: Sample rate of y
+    
+    Returns:
+        np.array: Feature vector of shape (48,)
+    """
+    # One magnitude STFT shared by every spectral feature below
+    S = np.abs(librosa.stft(y, n_fft=1024, hop_length=512))
+    power = S ** 2
+    
+    # MFCC (Mel-frequency cepstral coefficients) - 20 coefficients
+    mel = librosa.feature.melspectrogram(S=power, sr=sr)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=20)
+    
+    # Spectral features
+    spec_centroid = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
+    spec_rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr)[0]
+    spec_bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sr)[0]
+    zero_crossing_rate = frame_zero_crossing_rate(y)
+    
+    # Chroma features: project the shared power spectrogram onto a cached
+    # filter bank, normalized per frame exactly as chroma_stft does
+    chroma = chroma_filterbank(sr, 2 * (power.shape[0] - 1)) @ power
+    chroma = librosa.util.normalize(chroma, norm=np.inf, axis=0)
+    
+    # Write the 48 features straight into one preallocated vector
+    features = np.empty(48, dtype=np.float32)
+    features[0:20] = mfcc.mean(axis=1)                    # MFCC means
+    features[20:40] = mfcc.std(axis=1)                    # MFCC stds
+    features[40] = spec_centroid.mean()
+    features[41] = spec_centroid.std()
+    features[42] = spec_rolloff.mean()
+    features[43] = spec_rolloff.std()
+    features[44] = spec_bandwidth.mean()
+    features[45] = zero_crossing_rate.mean()
+    features[46] = zero_crossing_rate.std()
+    features[47] = chroma.mean()
+    
+    return features
+
+
+def extract_features_batch(paths, num_workers=None):
+    """
+    Extract features for many audio files using a pool of worker processes.
+    
+    librosa's Python-level code holds the GIL, so bulk extraction (e.g. building
+    a training set) scales better across processes than threads.
+    
+    Args:
+        paths: List of audio file paths
+        num_workers: Number of worker processes (default: CPU count)
+    
+    Returns:
+        np.array: Feature matrix of shape (len(paths), 48), in input order
+    """
+    if not paths:
+        return np.empty((0, 48), dtype=np.float32)
+    
+    from multiprocessing import Pool
+    
+    num_workers = num_workers or os.cpu_count()
+    chunksize = max(1, len(paths) // (num_workers * 4))
+    
+    with Pool(num_workers) as pool:
+        features = pool.map(extract_features, paths, chunksize=chunksize)
+    
+    return np.vstack(features)
+
+
 # --------------------------------- 
 # Model Training (for initial setup)
 # --------------------------------- 
@@ -84,28 +359,33 @@ def train_model(X_train, y_train):
     Returns:
         tuple: (trained_model, scaler)
     """
-    # Standardize features
+    # Standardize features (float32, matching what extract_features returns)
+    X_train = np.asarray(X_train, dtype=np.float32)
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     
     # Train Random Forest classifier
     model = RandomForestClassifier(
-        n_estimators=100,
-        max_depth=20,
+        n_estimators=50,
+        max_depth=8,
         min_samples_split=5,
-        min_samples_leaf=2,
+        min_samples_leaf=4,
         random_state=42,
         n_jobs=-1
     )
     
     model.fit(X_train_scaled, y_train)
     
-    # Save model and scaler
-    with open(MODEL_PATH, 'wb') as f:
-        pickle.dump(model, f)
+    # Save model and scaler uncompressed, which loads faster
+    joblib.dump(model, MODEL_PATH, compress=0, protocol=5)
+    joblib.dump(scaler, SCALER_PATH, compress=0, protocol=5)
+    
+    # Save the flattened forest that predictions memory-map
+    export_forest(model)
     
-    with open(SCALER_PATH, 'wb') as f:
-        pickle.dump(scaler, f)
+    # Serve the freshly trained model from now on
+    with _model_lock:
+        cache_model(model, scaler)
     
     print(f"Model trained and saved to {MODEL_PATH}")
     print(f"Scaler saved to {SCALER_PATH}")
@@ -121,48 +401,33 @@ def create_synthetic_training_data():
     Returns:
         tuple: (X_train, y_train)
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Simulate 100 samples (50 AI, 50 Human)
     n_samples = 100
     n_features = 48
+    half = n_samples // 2
     
-    X_train = []
-    y_train = []
+    X_train = np.empty((n_samples, n_features), dtype=np.float32)
     
-    # Generate synthetic AI-generated voice features
+    # Synthetic AI-generated voice features (first half)
     # AI voices tend to have: lower variance, more uniform patterns
-    for i in range(n_samples // 2):
-        # MFCC mean (more centered)
-        mfcc_mean = np.random.normal(0, 10, 20)
-        # MFCC std (lower variance)
-        mfcc_std = np.random.uniform(0.5, 3, 20)
-        # Spectral features (more uniform) - 7 features
-        spec_features = np.random.uniform(500, 2000, 7)
-        # Zero crossing rate features - 1 feature
-        zcr_std = np.random.uniform(0.05, 0.15, 1)
-        
-        features = np.hstack([mfcc_mean, mfcc_std, spec_features, zcr_std])
-        X_train.append(features)
-        y_train.append(1)  # AI_GENERATED
+    X_train[:half, 0:20] = rng.normal(0, 10, (half, 20))         # MFCC mean (more centered)
+    X_train[:half, 20:40] = rng.uniform(0.5, 3, (half, 20))      # MFCC std (lower variance)
+    X_train[:half, 40:47] = rng.uniform(500, 2000, (half, 7))    # Spectral features (more uniform)
+    X_train[:half, 47:48] = rng.uniform(0.05, 0.15, (half, 1))   # Zero crossing rate feature
     
-    # Generate synthetic human voice features
+    # Synthetic human voice features (second half)
     # Human voices have: higher variance, more natural irregularities
-    for i in range(n_samples // 2):
-        # MFCC mean (more varied)
-        mfcc_mean = np.random.normal(0, 15, 20)
-        # MFCC std (higher variance)
-        mfcc_std = np.random.uniform(3, 8, 20)
-        # Spectral features (more varied) - 7 features
-        spec_features = np.random.uniform(300, 3000, 7)
-        # Zero crossing rate features - 1 feature
-        zcr_std = np.random.uniform(0.08, 0.25, 1)
-        
-        features = np.hstack([mfcc_mean, mfcc_std, spec_features, zcr_std])
-        X_train.append(features)
-        y_train.append(0)  # HUMAN
+    X_train[half:, 0:20] = rng.normal(0, 15, (half, 20))         # MFCC mean (more varied)
+    X_train[half:, 20:40] = rng.uniform(3, 8, (half, 20))        # MFCC std (higher variance)
+    X_train[half:, 40:47] = rng.uniform(300, 3000, (half, 7))    # Spectral features (more varied)
+    X_train[half:, 47:48] = rng.uniform(0.08, 0.25, (half, 1))   # Zero crossing rate feature
+    
+    # 1 = AI_GENERATED, 0 = HUMAN
+    y_train = np.concatenate([np.ones(half, dtype=np.int64), np.zeros(half, dtype=np.int64)])
     
-    return np.array(X_train), np.array(y_train)
+    return X_train, y_train
 
 
 def initialize_model():
@@ -181,6 +446,140 @@ def initialize_model():
 # Model Loading and Prediction
 # --------------------------------- 
 
+@njit(cache=True)
+def _walk_forest(X, roots, feature, threshold, left, right, value):
+    """Average the leaf probabilities each tree assigns to each row of X"""
+    n_trees = roots.shape[0]
+    # Accumulate in float64 like scikit-learn; it is touched once per tree
+    probabilities = np.zeros((X.shape[0], value.shape[1]), dtype=np.float64)
+    
+    for i in range(X.shape[0]):
+        for t in range(n_trees):
+            node = roots[t]
+            # Leaves are the nodes that point back at themselves
+            while left[node] != node:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            probabilities[i] += value[node]
+        probabilities[i] /= n_trees
+    
+    return probabilities
+
+
+class FlatForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous node arrays.
+    
+    Every tree's nodes are concatenated (structure-of-arrays), and leaves
+    point back at themselves. predict_proba walks them in a Numba-compiled
+    loop instead of scikit-learn's per-tree Python dispatch.
+    """
+    
+    def __init__(self, model):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+            
+            roots.append(offset)
+            offset += tree.node_count
+        
+        # Store thresholds as float32 to halve the bytes walked per split.
+        # They are rounded down, so for float32 inputs x <= t32 exactly when
+        # x <= t, and every split goes the same way as in scikit-learn.
+        # Leaf values stay float64 so probabilities (and the confidences
+        # returned to clients) are exactly scikit-learn's.
+        threshold = np.concatenate(thresholds)
+        threshold32 = threshold.astype(np.float32)
+        threshold32 = np.where(
+            threshold32 > threshold, np.nextafter(threshold32, np.float32(-np.inf)), threshold32
+        )
+        
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = threshold32
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values).astype(np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.classes_ = model.classes_
+    
+    # Saved as <name>.npy in the forest directory
+    ARRAYS = ("feature", "threshold", "left", "right", "value", "roots", "classes_")
+    
+    # Text file in the forest directory naming the model the arrays came from
+    SOURCE_FILE = "source.txt"
+    
+    def save(self, directory, source_key=""):
+        """
+        Save the node arrays as .npy files in directory.
+        
+        The files are written to a fresh directory that is then renamed into
+        place, so a process loading concurrently never sees a partial set.
+        
+        Args:
+            directory: Destination directory (replaced if it exists)
+            source_key: Content hash of the model file the forest was built from
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        tmp_dir = tempfile.mkdtemp(prefix=".forest-", dir=parent)
+        try:
+            for name in self.ARRAYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+            with open(os.path.join(tmp_dir, self.SOURCE_FILE), 'w') as f:
+                f.write(source_key)
+            
+            # Move any previous set aside first: a directory can only be
+            # renamed over an empty one
+            old_dir = None
+            if os.path.isdir(directory):
+                old_dir = tempfile.mkdtemp(prefix=".forest-old-", dir=parent)
+                os.replace(directory, os.path.join(old_dir, "forest"))
+            os.replace(tmp_dir, directory)
+            if old_dir:
+                # Workers still mapping the old files keep them until they exit
+                shutil.rmtree(old_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
+    @staticmethod
+    def source_key(directory):
+        """Content hash of the model the saved arrays came from ("" if unknown)"""
+        with open(os.path.join(directory, FlatForest.SOURCE_FILE)) as f:
+            return f.read().strip()
+    
+    @classmethod
+    def load(cls, directory):
+        """Memory-map node arrays saved by save() (read-only, shared between processes)"""
+        forest = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+            # A plain ndarray view of the mapping, which Numba accepts
+            setattr(forest, name, np.asarray(array))
+        return forest
+    
+    def predict_proba(self, X):
+        """Average the leaf class probabilities of every tree, like the forest itself"""
+        # scikit-learn compares float32 features against its thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return _walk_forest(
+            X, self.roots, self.feature, self.threshold, self.left, self.right, self.value
+        )
+
+
 def load_model():
     """
     Load the trained model and scaler.
@@ -189,11 +588,9 @@ def load_model():
         tuple: (model, scaler)
     """
     try:
-        with open(MODEL_PATH, 'rb') as f:
-            model = pickle.load(f)
-        
-        with open(SCALER_PATH, 'rb') as f:
-            scaler = pickle.load(f)
+        # Files written by plain pickle.dump load here too
+        model = joblib.load(MODEL_PATH)
+        scaler = joblib.load(SCALER_PATH)
         
         return model, scaler
     
@@ -204,39 +601,141 @@ def load_model():
         )
 
 
-def predict_voice(path):
+def model_file_key():
+    """BLAKE2b hash of the saved model file, tying a saved forest to it"""
+    return audio_content_key(MODEL_PATH)
+
+
+def export_forest(model):
+    """Flatten the model (the one saved at MODEL_PATH) and save it to FOREST_DIR"""
+    FlatForest(model).save(FOREST_DIR, source_key=model_file_key())
+
+
+def load_forest(model):
+    """
+    Memory-map the saved forest if it was built from the current model file,
+    otherwise flatten the model in this process (nothing is written).
+    
+    Files are matched by content hash rather than modification time, which
+    volume mounts and cp -p / rsync -t can carry over from older copies.
+    
+    Args:
+        model: The loaded RandomForestClassifier
+    
+    Returns:
+        FlatForest
+    """
+    try:
+        if FlatForest.source_key(FOREST_DIR) == model_file_key():
+            return FlatForest.load(FOREST_DIR)
+    except (OSError, ValueError):
+        pass
+    return FlatForest(model)
+
+
+def load_scaling(scaler):
+    """
+    Derive (mean, inv_scale) from the scaler, for standardizing features
+    without scikit-learn's per-call input validation.
+    
+    Args:
+        scaler: The loaded StandardScaler
+    
+    Returns:
+        tuple: (mean, inv_scale) float32 arrays
+    """
+    mean = scaler.mean_.astype(np.float32)
+    scale = scaler.scale_.astype(np.float32)
+    
+    # Multiply by the reciprocal instead of dividing on every request
+    return mean, (1.0 / scale).astype(np.float32)
+
+
+def cache_model(model, scaler):
+    """Make model and scaler the shared ones served by predictions (call under _model_lock)"""
+    # Requests carry a handful of rows; joblib dispatch would dominate
+    model.n_jobs = 1
+    _model_cache["forest"] = load_forest(model)
+    _model_cache["scaling"] = load_scaling(scaler)
+    _model_cache["scaler"] = scaler
+    _model_cache["model"] = model
+
+
+def scale_features(features):
+    """Standardize feature rows with the cached scaler's mean and scale"""
+    get_model()
+    mean, inv_scale = _model_cache["scaling"]
+    return (features - mean) * inv_scale
+
+
+def get_model():
+    """
+    Return the shared (model, scaler), loading them once per process.
+    
+    Creates the initial model first if none has been trained yet.
+    
+    Returns:
+        tuple: (model, scaler)
+    """
+    if _model_cache["model"] is None:
+        with _model_lock:
+            if _model_cache["model"] is None:
+                initialize_model()
+                cache_model(*load_model())
+    
+    return _model_cache["model"], _model_cache["scaler"]
+
+
+def predict_scaled(features_scaled):
+    """
+    Classify already-scaled feature rows with the cached model.
+    
+    Walks the flattened copy of the scikit-learn forest. Labels are taken
+    from the probabilities, so the trees are only walked once.
+    
+    Args:
+        features_scaled: Standardized features (n_samples, 48)
+    
+    Returns:
+        tuple: (predictions, probabilities) with one row per sample
+    """
+    model, _ = get_model()
+    probabilities = _model_cache["forest"].predict_proba(features_scaled)
+    predictions = model.classes_[probabilities.argmax(axis=1)]
+    return predictions, probabilities
+
+
+def predict_voice(audio, fmt=None):
     """
     Classify audio as AI-generated or Human using trained ML model.
     
     Args:
-        path: Path to audio file
+        audio: Path to audio file, raw bytes, or binary file-like object
+        fmt: Audio format/extension (e.g. "mp3"), if known
     
     Returns:
         tuple: (label, confidence) where label is 'AI_GENERATED' or 'HUMAN'
                and confidence is between 0.0 and 1.0
     """
     try:
-        # Initialize model if it doesn't exist
-        initialize_model()
-        
-        # Load trained model and scaler
-        model, scaler = load_model()
+        # Load the model on first use
+        get_model()
         
         # Extract features from audio
-        features = extract_features(path)
+        features = extract_features(audio, fmt)
         
         # Reshape for prediction
         features = features.reshape(1, -1)
         
         # Standardize features
-        features_scaled = scaler.transform(features)
+        features_scaled = scale_features(features)
         
         # Get prediction and probability
-        prediction = model.predict(features_scaled)[0]
-        probabilities = model.predict_proba(features_scaled)[0]
+        predictions, probabilities = predict_scaled(features_scaled)
+        prediction = predictions[0]
         
-        # Get confidence score
-        confidence = float(max(probabilities))
+        # Confidence is the probability of the predicted (argmax) class
+        confidence = float(probabilities[0].max())
         
         # Map prediction to label
         if prediction == 1:
@@ -250,6 +749,71 @@ def predict_voice(path):
         raise Exception(f"Prediction failed: {str(e)}")
 
 
+def predict_voice_batch(audios, keys=None):
+    """
+    Classify several audio clips with a single model call.
+    
+    Args:
+        audios: List of (audio, fmt) pairs, accepting the same inputs as predict_voice
+        keys: Optional audio_content_key of each clip, so the feature cache
+              does not hash audio the caller has already hashed
+    
+    Returns:
+        list: One (label, confidence) tuple per clip, in order. Clips whose
+              features could not be extracted get the Exception instead, so
+              one bad upload does not fail the whole batch.
+    """
+    try:
+        get_model()
+    except Exception as e:
+        raise Exception(f"Prediction failed: {str(e)}")
+    
+    results = [None] * len(audios)
+    rows = []
+    row_index = []
+    
+    if keys is None:
+        keys = [None] * len(audios)
+    
+    futures = [
+        _extract_pool.submit(extract_features, audio, fmt, key)
+        for (audio, fmt), key in zip(audios, keys)
+    ]
+    
+    for i, future in enumerate(futures):
+        try:
+            rows.append(future.result())
+            row_index.append(i)
+        except Exception as e:
+            results[i] = Exception(f"Prediction failed: {str(e)}")
+    
+    if rows:
+        features_scaled = scale_features(np.vstack(rows))
+        predictions, probabilities = predict_scaled(features_scaled)
+        
+        for i, prediction, proba in zip(row_index, predictions, probabilities):
+            label = "AI_GENERATED" if prediction == 1 else "HUMAN"
+            results[i] = (label, float(proba.max()))
+    
+    return results
+
+
+def warmup():
+    """
+    Load the model and run one synthetic clip through the whole pipeline.
+    
+    Call at server startup so the first real request doesn't pay for lazy
+    imports, librosa's filter construction, or compiling _walk_forest, the
+    Numba kernel every prediction runs through.
+    """
+    get_model()
+    
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 1e-3, SAMPLE_RATE).astype(np.float32)
+    features = features_from_signal(y, SAMPLE_RATE).reshape(1, -1)
+    predict_scaled(scale_features(features))
+
+
 # --------------------------------- 
 # Feature Importance (Explainability)
 # --------------------------------- 
@@ -262,28 +826,15 @@ def get_feature_importance():
         dict: Feature names and their importance scores
     """
     try:
-        model, _ = load_model()
-        
-        feature_names = [
-            *[f"mfcc_mean_{i}" for i in range(20)],
-            *[f"mfcc_std_{i}" for i in range(20)],
-            "spec_centroid_mean", "spec_centroid_std",
-            "spec_rolloff_mean", "spec_rolloff_std",
-            "spec_bandwidth_mean",
-            "zcr_mean", "zcr_std",
-            "chroma_mean"
-        ]
+        model, _ = get_model()
         
         importances = model.feature_importances_
         
-        feature_importance = dict(zip(feature_names, importances))
-        
-        # Sort by importance
-        feature_importance = dict(
-            sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
-        )
-        
-        return feature_importance
+        # Most important first
+        return {
+            FEATURE_NAMES[i]: float(importances[i])
+            for i in np.argsort(-importances, kind="stable")
+        }
         
     except Exception as e:
         raise Exception(f"Could not get feature importance: {str(e)}")
@@ -307,10 +858,9 @@ def evaluate_model(X_test, y_test):
     from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
     
     try:
-        model, scaler = load_model()
-        
-        X_test_scaled = scaler.transform(X_test)
-        predictions = model.predict(X_test_scaled)
+        # Score exactly what the server serves: the cached scaling and forest
+        X_test = np.asarray(X_test, dtype=np.float32)
+        predictions, _ = predict_scaled(scale_features(X_test))
         
         metrics = {
             "accuracy": accuracy_score(y_test, predictions),
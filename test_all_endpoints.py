@@ -5,7 +5,6 @@ Complete test suite for AI Voice Detection API
 """
 
 import requests
-import base64
 from time import sleep
 
 # Configuration
@@ -122,18 +121,13 @@ def test_language_validation():
     try:
         # Create dummy audio
         dummy_audio = b"test"
-        audio_base64 = base64.b64encode(dummy_audio).decode()
         
         headers = {"x_api_key": API_KEY}
-        payload = {
-            "audio_base64": audio_base64,
-            "audio_format": "mp3",
-            "language": "invalid_language"
-        }
         
         response = requests.post(
             f"{API_URL}/detect",
-            json=payload,
+            files={"file": ("test.mp3", dummy_audio, "audio/mpeg")},
+            data={"audio_format": "mp3", "language": "invalid_language"},
             headers=headers
         )
         
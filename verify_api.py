@@ -1,12 +1,19 @@
 import os
 import io
+import gzip
+import tempfile
+import zlib
+import numpy as np
+import librosa
 from fastapi.testclient import TestClient
 from unittest.mock import patch
+from sklearn.ensemble import RandomForestClassifier
 
 # Set env var before importing main to match default behavior if needed
 os.environ["API_KEY"] = "teamAI_123"
 
-from main import app
+from main import app, MAX_REQUEST_BODY, MAX_BATCH_BODY
+from model import FlatForest, create_synthetic_training_data, frame_zero_crossing_rate
 
 client = TestClient(app)
 
@@ -18,12 +25,10 @@ def test_health():
 
 def test_predict_auth_missing():
     response = client.post("/predict")
-    # Should be 401 or 422 depending on implementation of Header(...), likely 422 if missing, but we implemented verify_api_key manually.
-    # Actually Header(...) acts as required, so if missing it might return 422 (Validation Error) from FastAPI or 401 if our logic catches it.
-    # Our verify_api_key defaults: x_api_key: str = Header(...)
-    # If missing, FastAPI returns 422.
-    assert response.status_code == 422
-    print("✅ /predict missing auth passed (422)")
+    # The API key middleware rejects the request before the body is validated
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or missing API key"
+    print("✅ /predict missing auth passed (401)")
 
 def test_predict_auth_invalid():
     response = client.post(
@@ -35,10 +40,26 @@ def test_predict_auth_invalid():
     assert response.json()["detail"] == "Invalid or missing API key"
     print("✅ /predict invalid auth passed (401)")
 
+def test_auth_behind_root_path():
+    # Mounted under a prefix (uvicorn --root-path /api), scope["path"] keeps
+    # the prefix; protected routes must still require the key
+    prefixed = TestClient(app, root_path="/api")
+    response = prefixed.get("/api/stats")
+    assert response.status_code == 401
+
+    response = prefixed.get("/api/stats", headers={"x-api-key": "teamAI_123"})
+    assert response.status_code == 200
+    print("✅ API key enforced behind a root path (401)")
+
 @patch("main.predict_voice")
 def test_predict_success(mock_predict):
     # Mock the simplified return from model
-    mock_predict.return_value = ("AI_GENERATED", 0.9876)
+    # Read the upload while the request is in flight; it is closed afterwards
+    received = {}
+    def fake_predict(audio, fmt):
+        received["audio"], received["fmt"] = audio.read(), fmt
+        return "AI_GENERATED", 0.9876
+    mock_predict.side_effect = fake_predict
 
     # Create dummy file
     file_content = b"fake audio content for mock"
@@ -54,20 +75,198 @@ def test_predict_success(mock_predict):
     assert data["label"] == "AI_GENERATED"
     assert data["confidence"] == 0.988  # round(0.9876, 3) -> 0.988
     
-    # Verify mock was called
+    # Verify mock was called with the uploaded stream, not a temp file path
     mock_predict.assert_called_once()
+    assert received["audio"] == file_content
+    assert received["fmt"] == "wav"
     
-    # Check if temp file was cleaned up (hard to check inside the test as it happens inside the function, 
-    # but we can trust the logic if no error raised)
     print("✅ /predict success flow passed")
 
+@patch("main.predict_voice_batch")
+def test_predict_batch(mock_batch):
+    mock_batch.return_value = [("HUMAN", 0.8123), Exception("Prediction failed: bad audio")]
+
+    response = client.post(
+        "/predict_batch",
+        headers={"x-api-key": "teamAI_123"},
+        files=[
+            ("files", ("a.wav", b"first clip", "audio/wav")),
+            ("files", ("b.mp3", b"second clip", "audio/mpeg")),
+        ]
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0] == {"label": "HUMAN", "confidence": 0.812}
+    assert results[1] == {"error": "Prediction failed: bad audio"}
+
+    # Both uploads go to the model in a single call, in order
+    mock_batch.assert_called_once()
+    (audios,) = mock_batch.call_args.args
+    assert [fmt for _, fmt in audios] == ["wav", "mp3"]
+    print("✅ /predict_batch flow passed")
+
+def test_stats_etag():
+    headers = {"x-api-key": "teamAI_123"}
+    response = client.get("/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=300"
+    etag = response.headers["etag"]
+
+    # Revalidating with the same ETag should return an empty 304
+    response = client.get("/stats", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    print("✅ /stats ETag revalidation passed (304)")
+
+def test_stats_etag_requires_key():
+    # A valid ETag must not let a client without the key skip authentication
+    etag = client.get("/stats", headers={"x-api-key": "teamAI_123"}).headers["etag"]
+    response = client.get("/stats", headers={"If-None-Match": etag})
+    assert response.status_code == 401
+    response = client.get("/stats", headers={"x-api-key": "wrong", "If-None-Match": etag})
+    assert response.status_code == 401
+    print("✅ /stats ETag without a valid key passed (401)")
+
+def test_root_html():
+    # API clients still get the JSON status check
+    response = client.get("/")
+    assert response.json() == {"status": "running"}
+
+    # Browsers get the precompressed page, then a 304 on revalidation
+    response = client.get("/", headers={"Accept": "text/html"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["content-encoding"] == "gzip"
+    assert b"<!DOCTYPE html>" in response.content
+    etag = response.headers["etag"]
+
+    response = client.get("/", headers={"Accept": "text/html", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert "Accept-Encoding" in response.headers["vary"]
+
+    # The uncompressed page is a different representation with its own ETag
+    html = {"Accept": "text/html", "Accept-Encoding": "identity"}
+    response = client.get("/", headers={**html, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] != etag
+    assert "Accept-Encoding" in response.headers["vary"]
+    response = client.get("/", headers={**html, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    print("✅ / HTML page and ETag revalidation passed")
+
+def test_request_body_limit():
+    headers = {"x-api-key": "teamAI_123", "Content-Type": "application/json"}
+    oversized = bytes(MAX_REQUEST_BODY + 1)
+
+    # A declared Content-Length over the limit is refused before reading
+    response = client.post("/detect-base64", headers=headers, content=oversized)
+    assert response.status_code == 413
+
+    # Chunked bodies are counted as they arrive
+    def stream(total, size=1 << 20):
+        for offset in range(0, total, size):
+            yield bytes(min(size, total - offset))
+
+    response = client.post("/detect-base64", headers=headers, content=stream(MAX_REQUEST_BODY + 1))
+    assert response.status_code == 413
+
+    # Batch endpoints have their own, larger but bounded, limit
+    response = client.post("/detect-batch", headers=headers, content=oversized)
+    assert response.status_code != 413
+    response = client.post("/detect-batch", headers=headers, content=stream(MAX_BATCH_BODY + 1))
+    assert response.status_code == 413
+
+    # The batch limit applies behind a root path too
+    prefixed = TestClient(app, root_path="/api")
+    response = prefixed.post("/api/detect-batch", headers=headers, content=oversized)
+    assert response.status_code != 413
+    print("✅ request body size limits enforced (413)")
+
+def test_gzip_request_body():
+    headers = {
+        "x-api-key": "teamAI_123",
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip"
+    }
+
+    # A valid gzip body is inflated and reaches request validation
+    body = gzip.compress(b'{"audio_base64": ""}')
+    response = client.post("/detect-base64", headers=headers, content=body)
+    assert response.status_code == 422
+
+    # A truncated stream is rejected as invalid gzip
+    response = client.post("/detect-base64", headers=headers, content=body[:-8])
+    assert response.status_code == 400
+
+    # A small body that inflates past the path's limit is cut off with 413
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    block = bytes(1 << 20)
+    bomb = b"".join(compressor.compress(block) for _ in range((MAX_REQUEST_BODY >> 20) + 1))
+    bomb += compressor.flush()
+    assert len(bomb) < 1 << 20
+    response = client.post("/detect-base64", headers=headers, content=bomb)
+    assert response.status_code == 413
+
+    # Batch endpoints inflate up to their own limit, behind a root path too
+    prefixed = TestClient(app, root_path="/api")
+    response = prefixed.post("/api/detect-batch", headers=headers, content=bomb)
+    assert response.status_code == 422
+    print("✅ gzip request bodies inflated and capped")
+
+def test_zero_crossing_rate_matches_librosa():
+    rng = np.random.default_rng(0)
+    # Shorter than one frame, a partial last frame, and a full 5s clip
+    for length in (1000, 3000, 12345, 40000):
+        y = rng.standard_normal(length).astype(np.float32)
+        y[::7] = 0
+        y[5] = -1e-12  # below librosa's threshold, so counted as zero
+        expected = librosa.feature.zero_crossing_rate(y)[0]
+        np.testing.assert_array_equal(frame_zero_crossing_rate(y), expected)
+    print("✅ frame_zero_crossing_rate matches librosa")
+
+def test_flat_forest_matches_sklearn():
+    X, y = create_synthetic_training_data()
+    forest = RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+    flat = FlatForest(forest)
+
+    X_test = np.random.default_rng(1).normal(X.mean(axis=0), X.std(axis=0), (500, X.shape[1]))
+    X_test = X_test.astype(np.float32)
+    expected = forest.predict_proba(X_test)
+
+    # These probabilities become response confidences: they must be identical
+    probabilities = flat.predict_proba(X_test)
+    assert probabilities.dtype == np.float64
+    np.testing.assert_array_equal(probabilities, expected)
+    np.testing.assert_array_equal(
+        flat.classes_[probabilities.argmax(axis=1)], forest.predict(X_test)
+    )
+
+    # The saved, memory-mapped arrays give identical results
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "forest")
+        flat.save(path)
+        np.testing.assert_array_equal(FlatForest.load(path).predict_proba(X_test), probabilities)
+    print("✅ FlatForest matches RandomForestClassifier")
+
 def run_tests():
     print("Running verification tests...")
     try:
         test_health()
         test_predict_auth_missing()
         test_predict_auth_invalid()
+        test_auth_behind_root_path()
         test_predict_success()
+        test_predict_batch()
+        test_stats_etag()
+        test_stats_etag_requires_key()
+        test_root_html()
+        test_request_body_limit()
+        test_gzip_request_body()
+        test_zero_crossing_rate_matches_librosa()
+        test_flat_forest_matches_sklearn()
         print("\n🎉 All verification tests passed!")
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}")